@@ -46,18 +46,54 @@ def getPiCodeVersion():
     else:
         return None
 
+class Protocol:
+    """Picklable handle of a protocol, as returned by findProtocol().
+    Wraps a Swig Object of type 'protocol_t *', and is pickled as the protocol name only,
+    so it can be passed to other processes, like 'concurrent.futures.ProcessPoolExecutor' tasks,
+    where it is rebound through the per-process cache of findProtocol().
+    """
+
+    __slots__ = ('name', 'handle')
+
+    def __init__(self, name:str, handle):
+        self.name   = name
+        self.handle = handle
+
+    def __reduce__(self):
+        return (findProtocol, (self.name,))
+
+    def __eq__(self, other):
+        return isinstance(other,Protocol) and other.name == self.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        return "Protocol(%r)" % self.name
+
+
+# Per-process cache of found protocols by name, protocol_t pointers are static in the PiCode library
+_protocols = dict()
+
 def findProtocol(name:str):
     """Find a protocol among all those initialized by name. 
-    Returns a Swig Object of type 'protocol_t *' or None on failure.
+    Returns a picklable Protocol wrapping a Swig Object of type 'protocol_t *' or None on failure.
     """
 
     if (not isinstance(name,str)):
         raise TypeError("in method 'findProtocol', argument 1 'name' must be a string.")
 
+    protocol = _protocols.get(name)
+
+    if protocol is not None:
+        return protocol
+
     result = _picode_wraper.findProtocol(name)
 
     if type(result).__name__ == 'SwigPyObject':
-        return result
+        protocol = Protocol(name, result)
+        _protocols[name] = protocol
+        return protocol
     else:
         return None
 
@@ -96,12 +132,15 @@ def pulseTrainToString(pulses_list:list, repeats:int=0):
 
 
 def encodeToPulseTrain(protocol, json_data:dict):
-    """Encodes a Swig Object of type 'protocol_t *' and a json data dict to a pulses list. 
+    """Encodes a Protocol or a Swig Object of type 'protocol_t *' and a json data dict to a pulses list. 
     Returns a pulses list or None on failure.
     """
     
+    if isinstance(protocol,Protocol):
+        protocol = protocol.handle
+
     if not type(protocol).__name__ == 'SwigPyObject':
-        raise TypeError("in method 'encodeToPulseTrain', argument 1 'protocol' must be a Swig Object of type 'protocol_t *'.")
+        raise TypeError("in method 'encodeToPulseTrain', argument 1 'protocol' must be a Protocol or a Swig Object of type 'protocol_t *'.")
 
     if (not isinstance(json_data,dict)):
         raise TypeError("in method 'encodeToPulseTrain', argument 2 'json_data' must be a dict.")
@@ -203,14 +242,85 @@ def stringToPulseTrain(pilight_string:str):
     return result
 
 
+class ProtocolRanking:
+    """Keeps decayed hit counters of decoded protocols, to promote the most frequent ones.
+    On each decoded frame all counters are multiplied by 'decay' and the counter of every
+    decoded protocol adds 1. Use one instance per decoder, fed with its decoded results dicts.
+    It only ranks protocols, the order in which the PiCode library tries protocols is unchanged.
+    """
+
+    def __init__(self, decay:float=0.99):
+
+        if (isinstance(decay,bool) or not isinstance(decay,(int,float))):
+            raise TypeError("in method 'ProtocolRanking', argument 1 'decay' must be a number.")
+
+        if (decay <= 0 or decay > 1):
+            raise TypeError("in method 'ProtocolRanking', argument 1 'decay' must be in range from 0 to 1.")
+
+        self.decay = decay
+        self._counters = dict()
+        # Instead of decaying all counters on each frame, the weight of new hits grows by 1/decay
+        self._weight = 1.0
+
+    def _credit(self, protocol_names):
+        """Adds a hit to the counters of all protocols decoded from the same frame."""
+
+        for protocol_name in protocol_names:
+            self._counters[protocol_name] = self._counters.get(protocol_name, 0.0) + self._weight
+
+        self._weight /= self.decay
+
+        # Rescale all counters before the weight of new hits overflows
+        if self._weight > 1e100:
+            for name in self._counters:
+                self._counters[name] /= self._weight
+            self._weight = 1.0
+
+    def hit(self, protocol_name:str):
+        """Adds a hit to the counter of a protocol."""
+
+        self._credit((protocol_name,))
+
+    def update(self, result:dict):
+        """Adds a hit to the counter of every protocol of a results dict, 
+        as returned by decodePulseTrain() or decodeString(). Results without protocols are ignored.
+        """
+
+        if (result is not None and not isinstance(result,dict)):
+            raise TypeError("in method 'update', argument 1 'result' must be a dict.")
+
+        protocols = result.get('protocols') if result else None
+
+        if protocols:
+            self._credit([ name for protocol in protocols for name in protocol ])
+
+    def score(self, protocol_name:str):
+        """Returns the decayed hit counter of a protocol."""
+
+        return self._counters.get(protocol_name, 0.0) / (self._weight * self.decay)
+
+    def scores(self):
+        """Returns a dict of protocol names to decayed hit counters, most frequent first."""
+
+        return { name: self.score(name) for name in self.order(self._counters) }
+
+    def order(self, protocol_names):
+        """Returns a list of protocol names sorted by decayed hit counter, most frequent first.
+        Protocols with the same counter keep their relative order.
+        """
+
+        return sorted(protocol_names, key=lambda name: -self._counters.get(name, 0.0))
+
+
 def decodePulseTrain(pulses_list:list):
     """Decodes a list of pulses to a results dict.
+    A memoryview of unsigned integers is also accepted as pulses list, like a shared memory slot.
     Returns a dict always, with a key "protocols" and a list of decoded protocols as its value, 
     which will be empty if none are decoded, like as { 'protocols': [ ] }
     """
 
-    if ( not isinstance(pulses_list,list) ):
-        raise TypeError("in method 'decodePulseTrain', argument 1 'pulses_list' must be a list.")
+    if ( not isinstance(pulses_list,(list,memoryview)) ):
+        raise TypeError("in method 'decodePulseTrain', argument 1 'pulses_list' must be a list or a memoryview.")
 
     pulses = _picode_wraper.uint32Array(len(pulses_list))
 
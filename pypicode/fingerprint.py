@@ -0,0 +1,245 @@
+"""
+Fingerprint index for clustering undecoded signals with pyPiCode.
+
+Groups frames that match no protocol by a tolerance-quantized fingerprint
+of their pilight string form (pulse indexes and pulse lengths table),
+incrementally in O(1) per frame, to triage unknown traffic in real time.
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+from collections import OrderedDict as _OrderedDict
+from itertools import product as _product
+from math import log as _log
+import re as _re
+import time as _time
+
+import pypicode as _picode
+
+# Pilight string form: pulse indexes and pulse lengths table, repeats are ignored
+_PILIGHT_STRING = _re.compile(r'c:([0-9]+);p:([0-9]+(?:,[0-9]+)*)(?:;r:[0-9]+)?@')
+
+# Max distance, in buckets, of a pulse length to a bucket edge to also look up the neighbour bucket
+_EDGE_MARGIN = 0.25
+
+# Max number of pulse lengths near a bucket edge looked up in both buckets, up to 2**6 fingerprints
+_MAX_EDGES = 6
+
+
+class Cluster:
+    """Frames of an index sharing the same fingerprint.
+
+    fingerprint:     cluster key, as returned by FingerprintIndex.fingerprint().
+    count:           number of frames.
+    first_seen:      timestamp of the first frame.
+    last_seen:       timestamp of the last frame.
+    representative:  pilight string of the first frame.
+    """
+
+    __slots__ = ('fingerprint', 'count', 'first_seen', 'last_seen', 'representative')
+
+    def __init__(self, fingerprint, representative:str, timestamp:float):
+        self.fingerprint    = fingerprint
+        self.count          = 0
+        self.first_seen     = timestamp
+        self.last_seen      = timestamp
+        self.representative = representative
+
+    def __reduce__(self):
+        return (_cluster, (self.fingerprint, self.count, self.first_seen, self.last_seen, self.representative))
+
+    def pulses(self):
+        """Returns the pulses list of the representative frame or None on failure."""
+        return _picode.stringToPulseTrain(self.representative)
+
+    def __repr__(self):
+        return "Cluster(count=%d, first_seen=%r, last_seen=%r, representative=%r)" % (
+            self.count, self.first_seen, self.last_seen, self.representative)
+
+
+def _cluster(fingerprint, count, first_seen, last_seen, representative):
+    """Rebuilds a pickled Cluster."""
+
+    cluster = Cluster(fingerprint, representative, first_seen)
+    cluster.count     = count
+    cluster.last_seen = last_seen
+
+    return cluster
+
+
+class FingerprintIndex:
+    """Index of unknown frames clustered by tolerance-quantized fingerprint.
+
+    tolerance:     relative tolerance of pulse lengths, used as width of logarithmic buckets.
+                   Pulse lengths near a bucket edge are also looked up in the neighbour bucket,
+                   so frames close to each other but on both sides of an edge join the same cluster.
+    code:          if True, fingerprint includes the pulse indexes, so only identical transmissions
+                   are grouped, else only the frame length, for devices sending variable payloads.
+    max_clusters:  max number of clusters, the least recently seen is evicted when exceeded.
+    """
+
+    def __init__(self, tolerance:float=0.1, code:bool=True, max_clusters:int=None):
+
+        if (not isinstance(tolerance,(int,float))):
+            raise TypeError("in method 'FingerprintIndex', argument 1 'tolerance' must be a number.")
+
+        if (tolerance <= 0 or tolerance >= 1):
+            raise TypeError("in method 'FingerprintIndex', argument 1 'tolerance' must be in range from 0 to 1.")
+
+        if (not isinstance(code,bool)):
+            raise TypeError("in method 'FingerprintIndex', argument 2 'code' must be a boolean.")
+
+        if (max_clusters is not None and (not isinstance(max_clusters,int) or max_clusters < 1)):
+            raise TypeError("in method 'FingerprintIndex', argument 3 'max_clusters' must be a positive integer.")
+
+        self.tolerance    = tolerance
+        self.code         = code
+        self.max_clusters = max_clusters
+        self.evicted      = 0
+
+        self._log_base = _log(1 + tolerance)
+        # Least recently seen cluster first
+        self._clusters = _OrderedDict()
+
+    def _positions(self, pilight_string:str):
+        """Parses a string in pilight format to its code key and the bucket position of each pulse length.
+        Returns a tuple or None on failure.
+        """
+
+        match = _PILIGHT_STRING.fullmatch(pilight_string)
+
+        if match is None:
+            return None
+
+        code, table = match.groups()
+
+        positions = [ _log(max(int(pulse), 1)) / self._log_base for pulse in table.split(',') ]
+
+        return (code if self.code else len(code), positions)
+
+    def fingerprint(self, pilight_string:str):
+        """Computes the fingerprint of a string in pilight format.
+        Returns a hashable tuple or None on failure.
+        """
+
+        parsed = self._positions(pilight_string)
+
+        if parsed is None:
+            return None
+
+        return (parsed[0], tuple( round(position) for position in parsed[1] ))
+
+    def fingerprints(self, pilight_string:str):
+        """Computes the fingerprint of a string in pilight format, followed by the alternative
+        fingerprints with pulse lengths near a bucket edge moved to the neighbour bucket.
+        Returns a list of hashable tuples, empty on failure.
+        """
+
+        parsed = self._positions(pilight_string)
+
+        if parsed is None:
+            return list()
+
+        code, positions = parsed
+
+        choices = [ [ round(position) ] for position in positions ]
+
+        # Pulse lengths nearest to a bucket edge first
+        edges = sorted(range(len(positions)), key=lambda i: 0.5 - abs(positions[i] - round(positions[i])))
+
+        for i in edges[:_MAX_EDGES]:
+            offset = positions[i] - choices[i][0]
+            if 0.5 - abs(offset) < _EDGE_MARGIN:
+                choices[i].append(choices[i][0] + (1 if offset > 0 else -1))
+
+        return [ (code, buckets) for buckets in _product(*choices) ]
+
+    def find(self, pilight_string:str, keys):
+        """Finds the fingerprint of a string in pilight format among existing keys, like a dict,
+        looking up neighbour buckets of pulse lengths near a bucket edge.
+        Returns the existing key, else the fingerprint of the string, or None on failure.
+        """
+
+        fingerprints = self.fingerprints(pilight_string)
+
+        for fingerprint in fingerprints:
+            if fingerprint in keys:
+                return fingerprint
+
+        return fingerprints[0] if fingerprints else None
+
+    def addString(self, pilight_string:str, timestamp:float=None):
+        """Adds a frame as string in pilight format to its cluster, creating it if new.
+        Returns the Cluster or None if it is not a valid pilight string.
+        """
+
+        if (not isinstance(pilight_string,str)):
+            raise TypeError("in method 'addString', argument 1 'pilight_string' must be a string.")
+
+        fingerprint = self.find(pilight_string, self._clusters)
+
+        if fingerprint is None:
+            return None
+
+        if timestamp is None:
+            timestamp = _time.time()
+
+        cluster = self._clusters.get(fingerprint)
+
+        if cluster is None:
+            cluster = Cluster(fingerprint, pilight_string, timestamp)
+            self._clusters[fingerprint] = cluster
+            if self.max_clusters is not None and len(self._clusters) > self.max_clusters:
+                self._clusters.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._clusters.move_to_end(fingerprint)
+
+        cluster.count += 1
+        cluster.last_seen = timestamp
+
+        return cluster
+
+    def add(self, pulses_list:list, timestamp:float=None):
+        """Adds a frame as pulses list to its cluster, creating it if new.
+        Returns the Cluster or None if it can not be converted to a pilight string.
+        """
+
+        pilight_string = _picode.pulseTrainToString(pulses_list)
+
+        if pilight_string is None:
+            return None
+
+        return self.addString(pilight_string, timestamp)
+
+    def addUnknown(self, pulses_list:list, timestamp:float=None):
+        """Decodes a pulses list, adding it to the index if no protocol is decoded.
+        Returns the results dict of decodePulseTrain().
+        """
+
+        result = _picode.decodePulseTrain(pulses_list)
+
+        if not result.get('protocols'):
+            self.add(pulses_list, timestamp)
+
+        return result
+
+    def clusters(self, min_count:int=1):
+        """Returns a list of clusters with at least 'min_count' frames, most frequent first."""
+
+        return sorted(( cluster for cluster in self._clusters.values() if cluster.count >= min_count ),
+                      key=lambda cluster: cluster.count, reverse=True)
+
+    def __len__(self):
+        return len(self._clusters)
+
+    def __iter__(self):
+        return iter(self._clusters.values())
+
+    def clear(self):
+        """Removes all clusters."""
+        self._clusters.clear()
+        self.evicted = 0
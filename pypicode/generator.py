@@ -0,0 +1,325 @@
+"""
+Synthetic RF traffic generator for pyPiCode.
+
+Produces realistic pulse trains or pilight strings from random valid field
+values of each supported protocol, with optional timing jitter, noise frames,
+truncation and repeats, to load test decoders at controlled rates.
+
+Deterministic when seeded, so benchmark runs are reproducible.
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+import random as _random
+import socket as _socket
+import time as _time
+
+import pypicode as _picode
+
+# Names of the 433.92Mhz protocols implemented by the PiCode library, from the 'pilight' project.
+# Names not initialized by the library, or protocols it can only decode, are dropped when probed.
+PROTOCOL_NAMES = [
+    'alecto_ws1700', 'alecto_wsd17', 'alecto_wx500', 'arctech_contact', 'arctech_dimmer',
+    'arctech_dusk', 'arctech_motion', 'arctech_screen', 'arctech_switch', 'arctech_switch_old',
+    'auriol', 'beamish_switch', 'clarus_switch', 'cleverwatts', 'conrad_rsl_contact',
+    'conrad_rsl_switch', 'daycom', 'ehome', 'elro_300_switch', 'elro_400_switch',
+    'elro_800_contact', 'elro_800_switch', 'eurodomest_switch', 'ev1527', 'fanju',
+    'gt1000', 'heitech', 'hoermann', 'impuls', 'intertechno_old', 'iwds07', 'kerui_d026',
+    'logilink_switch', 'mumbi', 'nexus', 'ninjablocks_weather', 'pollin', 'quigg_gt1000',
+    'quigg_gt7000', 'quigg_gt9000', 'quigg_screen', 'rc101', 'rev1_switch', 'rev2_switch',
+    'rev3_switch', 'rsl366', 'sc2262', 'secudo_smoke_sensor', 'selectremote', 'silvercrest',
+    'smartwares_switch', 'techlico_switch', 'teknihall', 'tfa', 'tfa2017', 'tfa30', 'x10',
+]
+
+# Field specs of protocols whose valid field ranges are known.
+# A tuple (min, max) is an inclusive integer range, a list is a set of choices.
+# The 'state' field is converted to an 'on'/'off' key by the encoder functions.
+PROTOCOL_FIELDS = {
+    'arctech_switch':    {'id': (0, 67108863), 'unit': (0, 15), 'state': ['on', 'off']},
+    'arctech_dimmer':    {'id': (0, 67108863), 'unit': (0, 15), 'state': ['on', 'off']},
+    'arctech_switch_old':{'id': (0, 31),       'unit': (0, 15), 'state': ['on', 'off']},
+    'beamish_switch':    {'id': (0, 65535),    'unit': (1, 4),  'state': ['on', 'off']},
+    'cleverwatts':       {'id': (0, 1048575),  'unit': (0, 3),  'state': ['on', 'off']},
+    'conrad_rsl_switch': {'id': (1, 3),        'unit': (1, 3),  'state': ['on', 'off']},
+    'elro_800_switch':   {'systemcode': (0, 31), 'unitcode': (0, 31), 'state': ['on', 'off']},
+    'impuls':            {'systemcode': (0, 31), 'programcode': (0, 31), 'state': ['on', 'off']},
+    'intertechno_old':   {'id': (0, 15),       'unit': (0, 15), 'state': ['on', 'off']},
+    'rsl366':            {'systemcode': (1, 4), 'programcode': (1, 4), 'state': ['on', 'off']},
+}
+
+# Common field specs of switch protocols, probed in order for protocols without a known field spec.
+# Ranges are kept small so that they are valid for most protocols sharing the same field names.
+GENERIC_FIELDS = [
+    {'id': (1, 15),         'unit': (1, 3),        'state': ['on', 'off']},
+    {'systemcode': (1, 15), 'unitcode': (1, 3),    'state': ['on', 'off']},
+    {'systemcode': (1, 15), 'programcode': (1, 3), 'state': ['on', 'off']},
+    {'unitcode': (1, 15),   'state': ['on', 'off']},
+    {'id': (1, 15),         'state': ['on', 'off']},
+]
+
+# Number of random encode attempts to accept a protocol field spec as valid
+_PROBE_ATTEMPTS = 8
+
+
+class TrafficGenerator:
+    """Generates synthetic frames of encodable protocols.
+
+    mix:       dict of protocol name to relative weight, defaults to all PROTOCOL_NAMES equally.
+    fields:    dict of protocol name to field spec, merged over PROTOCOL_FIELDS.
+               Protocols without field spec are probed with each of GENERIC_FIELDS.
+
+    Protocols that can not be encoded from any field spec are dropped, and listed in 'dropped'.
+    jitter:    max relative timing deviation applied to each pulse, like as 0.05 for 5%.
+    noise:     probability of emitting a random undecodable frame instead of a protocol frame.
+    truncate:  probability of cutting a protocol frame at a random pulse.
+    repeats:   number of times each transmission is emitted, an int or a (min, max) tuple.
+    seed:      seed of the private random generator, None for non deterministic output.
+    """
+
+    def __init__(self, mix:dict=None, fields:dict=None, jitter:float=0.0, noise:float=0.0,
+                 truncate:float=0.0, repeats=1, seed=None):
+
+        if (fields is not None and not isinstance(fields,dict)):
+            raise TypeError("in method 'TrafficGenerator', argument 'fields' must be a dict.")
+
+        if (mix is not None and not isinstance(mix,dict)):
+            raise TypeError("in method 'TrafficGenerator', argument 'mix' must be a dict.")
+
+        for name, value in (('jitter',jitter),('noise',noise),('truncate',truncate)):
+            if (not isinstance(value,(int,float))):
+                raise TypeError("in method 'TrafficGenerator', argument '%s' must be a number." % name)
+            if (value < 0 or value > 1):
+                raise TypeError("in method 'TrafficGenerator', argument '%s' must be in range from 0 to 1." % name)
+
+        if isinstance(repeats,int):
+            repeats = (repeats, repeats)
+
+        if (not isinstance(repeats,tuple) or len(repeats) != 2 or repeats[0] < 1 or repeats[0] > repeats[1]):
+            raise TypeError("in method 'TrafficGenerator', argument 'repeats' must be a positive int or a (min, max) tuple.")
+
+        self.fields = dict(PROTOCOL_FIELDS)
+        if fields:
+            self.fields.update(fields)
+
+        if mix is None:
+            mix = { name: 1 for name in PROTOCOL_NAMES }
+
+        self.jitter   = jitter
+        self.noise    = noise
+        self.truncate = truncate
+        self.repeats  = repeats
+
+        self._random = _random.Random(seed)
+
+        # Keep only protocols that the PiCode library is able to encode from a field spec
+        self.protocols = list()
+        self.dropped   = list()
+
+        for name in sorted(mix):
+            if mix[name] > 0:
+                if self._probe(name):
+                    self.protocols.append(name)
+                else:
+                    self.dropped.append(name)
+
+        self.weights = [ mix[name] for name in self.protocols ]
+
+        if not self.protocols:
+            raise TypeError("in method 'TrafficGenerator', no encodable protocols in mix.")
+
+    def _probe(self, protocol_name:str):
+        """Checks if a protocol can be encoded from random values of its field spec,
+        or of the first generic field spec that can be encoded, which is kept as its field spec.
+        """
+
+        if protocol_name in self.fields:
+            candidates = [ self.fields[protocol_name] ]
+        else:
+            candidates = GENERIC_FIELDS
+
+        for spec in candidates:
+            self.fields[protocol_name] = spec
+            for _ in range(_PROBE_ATTEMPTS):
+                if _picode.encodeToPulseTrainByName(protocol_name, self.randomFields(protocol_name)):
+                    return True
+
+        del self.fields[protocol_name]
+
+        return False
+
+    def randomFields(self, protocol_name:str):
+        """Chooses random values for each field of a protocol field spec.
+        Returns a json data dict.
+        """
+
+        json_data = dict()
+
+        for field, spec in self.fields[protocol_name].items():
+            if isinstance(spec,tuple):
+                json_data[field] = self._random.randint(spec[0], spec[1])
+            else:
+                json_data[field] = self._random.choice(spec)
+
+        return json_data
+
+    def _jitter(self, pulses_list:list):
+        """Applies random relative timing deviation to each pulse."""
+
+        if self.jitter == 0:
+            return pulses_list
+
+        uniform = self._random.uniform
+        jitter  = self.jitter
+
+        return [ max(1, int(pulse * (1 + uniform(-jitter, jitter)))) for pulse in pulses_list ]
+
+    def _noiseFrame(self):
+        """Builds a random pulses list of a few pulse lengths ended by a long gap pulse."""
+
+        lengths = [ self._random.randint(100, 3000) for _ in range(self._random.randint(2, 4)) ]
+        pulses_list = self._random.choices(lengths, k=self._random.randint(16, 128) - 1)
+        pulses_list.append(self._random.randint(5000, 15000))
+
+        return pulses_list
+
+    def frames(self, count:int=None):
+        """Yields tuples (protocol_name, json_data, pulses_list), endless if count is None.
+        Noise frames have protocol_name and json_data set to None.
+        Repeated transmissions are yielded as consecutive frames.
+        """
+
+        if (count is not None and not isinstance(count,int)):
+            raise TypeError("in method 'frames', argument 1 'count' must be an integer.")
+
+        emitted = 0
+
+        while count is None or emitted < count:
+
+            if self.noise > 0 and self._random.random() < self.noise:
+                protocol_name, json_data, pulses_list = None, None, self._noiseFrame()
+            else:
+                protocol_name = self._random.choices(self.protocols, self.weights)[0]
+                json_data = self.randomFields(protocol_name)
+                pulses_list = _picode.encodeToPulseTrainByName(protocol_name, json_data)
+
+                # Field values not accepted by the encoder, choose new ones
+                if not pulses_list:
+                    continue
+
+                if self.truncate > 0 and len(pulses_list) > 1 and self._random.random() < self.truncate:
+                    pulses_list = pulses_list[:self._random.randint(1, len(pulses_list) - 1)]
+
+            for _ in range(self._random.randint(self.repeats[0], self.repeats[1])):
+                if count is not None and emitted >= count:
+                    break
+                yield (protocol_name, json_data, self._jitter(pulses_list))
+                emitted += 1
+
+    def lines(self, count:int=None, format:str='string'):
+        """Yields frames as newline terminated bytes, endless if count is None.
+        Format 'string' for pilight strings or 'pulses' for comma separated pulses.
+        Frames not representable as a pilight string are replaced by new ones,
+        so exactly 'count' lines are yielded.
+        """
+
+        if (count is not None and not isinstance(count,int)):
+            raise TypeError("in method 'lines', argument 1 'count' must be an integer.")
+
+        if format not in ('string', 'pulses'):
+            raise TypeError("in method 'lines', argument 2 'format' must be 'string' or 'pulses'.")
+
+        emitted = 0
+
+        if count is not None and count <= 0:
+            return
+
+        for _, _, pulses_list in self.frames():
+            if format == 'string':
+                line = _picode.pulseTrainToString(pulses_list)
+                if line is None:
+                    continue
+            else:
+                line = ",".join(map(str, pulses_list))
+
+            yield (line + "\n").encode('ascii')
+
+            emitted += 1
+            if count is not None and emitted >= count:
+                return
+
+    def stream(self, sink, count:int=None, rate:float=None, format:str='string'):
+        """Writes frames to a sink at a target rate in frames per second, or as fast as possible if None.
+        Sink can be a file path (regular file or named pipe), a writable binary file object
+        or a connected socket object.
+        Returns the number of frames written, which is always 'count' if it is not None.
+        """
+
+        if (rate is not None and (not isinstance(rate,(int,float)) or rate <= 0)):
+            raise TypeError("in method 'stream', argument 3 'rate' must be a positive number.")
+
+        if isinstance(sink,str):
+            with open(sink, 'ab') as file:
+                return self.stream(file, count, rate, format)
+
+        if isinstance(sink,_socket.socket):
+            write = sink.sendall
+        elif hasattr(sink,'write'):
+            write = sink.write
+        else:
+            raise TypeError("in method 'stream', argument 1 'sink' must be a path, a file object or a socket.")
+
+        written = 0
+        start = _time.monotonic()
+
+        for line in self.lines(count, format):
+
+            # Sleep up to the scheduled time of this frame, so that delays do not accumulate
+            if rate is not None:
+                delay = start + written / rate - _time.monotonic()
+                if delay > 0:
+                    _time.sleep(delay)
+
+            write(line)
+            written += 1
+
+        if hasattr(sink,'flush'):
+            sink.flush()
+
+        return written
+
+
+if __name__ == "__main__":
+
+    import argparse, sys
+
+    parser = argparse.ArgumentParser(description="Synthetic RF traffic generator for pyPiCode.")
+    parser.add_argument("-n", "--count",    type=int,   default=None, help="number of frames, endless by default")
+    parser.add_argument("-r", "--rate",     type=float, default=None, help="frames per second, as fast as possible by default")
+    parser.add_argument("-f", "--format",   choices=['string', 'pulses'], default='string')
+    parser.add_argument("-s", "--seed",     type=int,   default=None)
+    parser.add_argument("-j", "--jitter",   type=float, default=0.0)
+    parser.add_argument("--noise",          type=float, default=0.0)
+    parser.add_argument("--truncate",       type=float, default=0.0)
+    parser.add_argument("--repeats",        type=int,   default=1)
+    parser.add_argument("-o", "--output",   default=None, help="file or named pipe path, stdout by default")
+    parser.add_argument("-u", "--unix",     default=None, help="local unix socket path to connect to")
+    args = parser.parse_args()
+
+    generator = TrafficGenerator(jitter=args.jitter, noise=args.noise, truncate=args.truncate,
+                                 repeats=args.repeats, seed=args.seed)
+
+    if args.unix:
+        sink = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+        sink.connect(args.unix)
+    elif args.output:
+        sink = args.output
+    else:
+        sink = sys.stdout.buffer
+
+    try:
+        generator.stream(sink, args.count, args.rate, args.format)
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
@@ -0,0 +1,241 @@
+"""
+Cross-receiver frame merger for pyPiCode.
+
+Merges the copies of each physical transmission decoded by several receivers,
+indexing frames by a canonical hash of the decoded payload, or of the
+tolerance-quantized pilight string, inside a sliding time window, so that each
+transmission is emitted exactly once with the set of receivers that heard it.
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+from collections import deque as _deque
+import time as _time
+
+from pypicode.fingerprint import FingerprintIndex as _FingerprintIndex
+
+
+class MergedFrame:
+    """Transmission heard by one or more receivers.
+
+    key:         canonical hash key of the frame.
+    frame:       first received frame, a results dict or a pilight string.
+    sources:     set of receiver source ids.
+    first_seen:  timestamp of the first received copy, which opens the window.
+    last_seen:   latest timestamp of the received copies.
+    count:       number of received copies.
+    """
+
+    __slots__ = ('key', 'frame', 'sources', 'first_seen', 'last_seen', 'count')
+
+    def __init__(self, key, frame, source, timestamp:float):
+        self.key        = key
+        self.frame      = frame
+        self.sources    = { source }
+        self.first_seen = timestamp
+        self.last_seen  = timestamp
+        self.count      = 1
+
+    def __reduce__(self):
+        return (_mergedFrame, (self.key, self.frame, self.sources, self.first_seen, self.last_seen, self.count))
+
+    def __repr__(self):
+        return "MergedFrame(frame=%r, sources=%r, first_seen=%r, count=%d)" % (
+            self.frame, self.sources, self.first_seen, self.count)
+
+
+def _mergedFrame(key, frame, sources, first_seen, last_seen, count):
+    """Rebuilds a pickled MergedFrame."""
+
+    merged = MergedFrame(key, frame, None, first_seen)
+    merged.sources   = sources
+    merged.last_seen = last_seen
+    merged.count     = count
+
+    return merged
+
+
+def _canonical(value):
+    """Returns a hashable canonical form of a decoded payload, independent of dict keys order."""
+
+    if isinstance(value,dict):
+        return tuple(sorted( (key, _canonical(item)) for key, item in value.items() ))
+
+    if isinstance(value,list):
+        return tuple( _canonical(item) for item in value )
+
+    return value
+
+
+class FrameMerger:
+    """Merges frames from multiple receivers inside a sliding time window.
+
+    window:     seconds from the first copy of a transmission during which other copies are merged.
+    tolerance:  relative tolerance of pulse lengths to quantize pilight strings, like FingerprintIndex.
+
+    Frames can be decoded results dicts, as returned by decodePulseTrain() or decodeString(),
+    keyed by their decoded protocols in any order, or pilight strings, keyed by their quantized
+    fingerprint, looking up neighbour buckets of pulse lengths near a bucket edge.
+    Copies are merged within the window from the first seen copy, and out of order frames older
+    than the window are emitted at once as separate transmissions.
+    Pending transmissions are kept sorted by first seen timestamp, so each one is evicted once, in amortized O(1).
+    Emitted transmissions are kept for one more window, so that late copies delayed past the
+    window are dropped and counted in 'late' instead of being emitted again.
+    """
+
+    def __init__(self, window:float=0.5, tolerance:float=0.1):
+
+        if (not isinstance(window,(int,float))):
+            raise TypeError("in method 'FrameMerger', argument 1 'window' must be a number.")
+
+        if (window <= 0):
+            raise TypeError("in method 'FrameMerger', argument 1 'window' must be greater than 0.")
+
+        self.window  = window
+        self.skipped = 0
+        self.late    = 0
+
+        self._fingerprints = _FingerprintIndex(tolerance).fingerprints
+        self._pending = dict()
+        # Pending transmissions sorted by first seen timestamp
+        self._expiry  = _deque()
+        # Emitted transmissions in emission order, kept to detect late copies
+        self._emitted = dict()
+        self._emitted_expiry = _deque()
+        self._now     = None
+
+    def _keys(self, frame):
+        """Computes the canonical hash key of a frame followed by its alternative keys.
+        Returns a list of hashable tuples, empty if the frame has no decoded protocols or is not a valid pilight string.
+        """
+
+        if isinstance(frame,dict):
+            protocols = frame.get('protocols')
+            # Receivers may report the same protocols in different order, like after sorting by a ProtocolRanking
+            return [ ('protocols', frozenset( _canonical(protocol) for protocol in protocols )) ] if protocols else list()
+
+        if isinstance(frame,str):
+            return [ ('string', fingerprint) for fingerprint in self._fingerprints(frame) ]
+
+        raise TypeError("in method 'key', argument 1 'frame' must be a dict or a string.")
+
+    def key(self, frame):
+        """Computes the canonical hash key of a frame.
+        Returns a hashable tuple or None if the frame has no decoded protocols or is not a valid pilight string.
+        """
+
+        keys = self._keys(frame)
+
+        return keys[0] if keys else None
+
+    def add(self, frame, source, timestamp:float=None):
+        """Adds a frame received by a source, merging it with a pending copy of the same transmission.
+        Returns a list of MergedFrame whose window has been closed by the timestamp of this frame.
+        """
+
+        keys = self._keys(frame)
+
+        if timestamp is None:
+            timestamp = _time.time()
+
+        # Close expired windows first, so a pending copy always belongs to the same transmission
+        emitted = self.expire(timestamp)
+
+        if not keys:
+            self.skipped += 1
+            return emitted
+
+        for key in keys:
+            merged = self._pending.get(key)
+            if merged is not None and abs(timestamp - merged.first_seen) <= self.window:
+                merged.sources.add(source)
+                merged.count += 1
+                if timestamp > merged.last_seen:
+                    merged.last_seen = timestamp
+                return emitted
+
+        # Copy of an already emitted transmission, delayed past its window
+        for key in keys:
+            merged = self._emitted.get(key)
+            if merged is not None and abs(timestamp - merged.first_seen) <= self.window:
+                self.late += 1
+                return emitted
+
+        merged = MergedFrame(keys[0], frame, source, timestamp)
+
+        # Frame delivered out of order, its window is already closed
+        if timestamp < self._now - self.window:
+            self._emitted.setdefault(merged.key, merged)
+            self._emitted_expiry.append(merged)
+            emitted.append(merged)
+            return emitted
+
+        self._pending[keys[0]] = merged
+
+        # Keep pending transmissions sorted by first seen, receivers deliver frames nearly in order
+        expiry = self._expiry
+        i = len(expiry)
+        while i and expiry[i-1].first_seen > timestamp:
+            i -= 1
+        expiry.insert(i, merged)
+
+        return emitted
+
+    def _emit(self, merged):
+        """Moves a pending transmission to the emitted ones."""
+
+        del self._pending[merged.key]
+        self._emitted[merged.key] = merged
+        self._emitted_expiry.append(merged)
+
+    def expire(self, timestamp:float=None):
+        """Advances time up to a timestamp, closing the window of pending transmissions.
+        Returns a list of MergedFrame in first seen order.
+        """
+
+        if timestamp is None:
+            timestamp = _time.time()
+
+        # Receivers may deliver frames slightly out of order, time never goes back
+        if self._now is None or timestamp > self._now:
+            self._now = timestamp
+
+        deadline = self._now - self.window
+        emitted  = list()
+        expiry   = self._expiry
+
+        while expiry and expiry[0].first_seen < deadline:
+            merged = expiry.popleft()
+            self._emit(merged)
+            emitted.append(merged)
+
+        # Forget emitted transmissions once no copy within their window can be accepted
+        deadline -= self.window
+        expiry = self._emitted_expiry
+
+        while expiry and expiry[0].first_seen < deadline:
+            merged = expiry.popleft()
+            if self._emitted.get(merged.key) is merged:
+                del self._emitted[merged.key]
+
+        return emitted
+
+    def flush(self):
+        """Closes the window of all pending transmissions.
+        Returns a list of MergedFrame in first seen order.
+        """
+
+        emitted = list(self._expiry)
+
+        self._expiry.clear()
+
+        for merged in emitted:
+            self._emit(merged)
+
+        return emitted
+
+    def __len__(self):
+        return len(self._pending)
@@ -0,0 +1,258 @@
+"""
+Shared memory ring buffer of pulse frames for pyPiCode.
+
+A single producer process (the receiver) writes fixed-size pulse frames into
+a 'multiprocessing.shared_memory' block, and several consumer processes
+(decoder workers) read them as memoryview slots without pickling or copying.
+The slots can be passed directly to decodePulseTrain(), which still copies
+each pulse into the C array of the PiCode library.
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+from array import array as _array
+import multiprocessing as _multiprocessing
+import time as _time
+from multiprocessing import shared_memory as _shared_memory
+
+from pypicode import _picode_wraper
+
+# Header layout, as unsigned 64 bits integers: write cursor, read cursor, closed flag
+_HEADER_SIZE = 3 * 8
+_WRITE, _READ, _CLOSED = 0, 1, 2
+
+# Slot layout: sequence as unsigned 64 bits integer, length and pulses as unsigned 32 bits integers
+_SLOT_HEADER_SIZE = 8 + 4
+
+# Number of busy loop checks before sleeping when waiting for a slot
+_SPIN_COUNT = 64
+
+# Sleep interval in seconds when waiting for a slot
+_SLEEP_TIME = 0.0001
+
+
+class PulseRing:
+    """Single producer, multiple consumers ring of pulse frames in shared memory.
+
+    slots:      number of frame slots of the ring.
+    maxrawlen:  max number of pulses of a frame, defaults to protocol_maxrawlen() of the PiCode library.
+    context:    multiprocessing context of the worker processes, defaults to the 'multiprocessing' module.
+
+    Each slot has a sequence number (Vyukov's bounded queue): the producer waits for a slot to be
+    released by consumers, and consumers claim frames by incrementing a read cursor under a lock
+    held only for that increment, so decoding runs in parallel without contention.
+    Only the transport is copy-free, decodePulseTrain() copies each pulse of a slot one by one,
+    and its per frame cost is much higher than the cost of getting the frame from the ring.
+
+    Pass the ring as argument of 'multiprocessing.Process' to attach it from worker processes.
+    The creator process must call unlink() when the ring is no longer used.
+    """
+
+    def __init__(self, slots:int=64, maxrawlen:int=None, context=None):
+
+        if (not isinstance(slots,int)):
+            raise TypeError("in method 'PulseRing', argument 1 'slots' must be an integer.")
+
+        if (slots < 1):
+            raise TypeError("in method 'PulseRing', argument 1 'slots' must be greater than 0.")
+
+        if maxrawlen is None:
+            maxrawlen = _picode_wraper.protocol_maxrawlen()
+
+        if (not isinstance(maxrawlen,int)):
+            raise TypeError("in method 'PulseRing', argument 2 'maxrawlen' must be an integer.")
+
+        if (maxrawlen < 1):
+            raise TypeError("in method 'PulseRing', argument 2 'maxrawlen' must be greater than 0.")
+
+        slot_size = _SLOT_HEADER_SIZE + 4 * maxrawlen
+        # Keep 8 bytes alignment of slot sequence numbers
+        slot_size += -slot_size % 8
+
+        shm = _shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + slots * slot_size)
+        shm.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+
+        if context is None:
+            context = _multiprocessing
+
+        self._attach(shm, slots, maxrawlen, slot_size, context.Lock(), True)
+
+        # Slot sequence starts at its own index, which means free for producer position 'index'
+        for index in range(slots):
+            self._sequences[index][0] = index
+
+    def _attach(self, shm, slots, maxrawlen, slot_size, lock, owner):
+        """Builds memoryviews of the ring header and of each slot."""
+
+        self._shm       = shm
+        self._lock      = lock
+        self._owner     = owner
+        self.slots      = slots
+        self.maxrawlen  = maxrawlen
+        self._slot_size = slot_size
+        self._claimed   = None
+
+        buf = shm.buf
+        self._header = buf[:_HEADER_SIZE].cast('Q')
+
+        self._sequences = list()
+        self._lengths   = list()
+        self._pulses    = list()
+
+        for index in range(slots):
+            offset = _HEADER_SIZE + index * slot_size
+            self._sequences.append(buf[offset:offset+8].cast('Q'))
+            self._lengths.append(buf[offset+8:offset+12].cast('I'))
+            self._pulses.append(buf[offset+12:offset+12+4*maxrawlen].cast('I'))
+
+    def __getstate__(self):
+        return (self._shm.name, self.slots, self.maxrawlen, self._slot_size, self._lock)
+
+    def __setstate__(self, state):
+        name, slots, maxrawlen, slot_size, lock = state
+        self._attach(_shared_memory.SharedMemory(name=name), slots, maxrawlen, slot_size, lock, False)
+
+    @property
+    def name(self):
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    def _wait(self, condition, timeout):
+        """Waits until a condition is true, spinning first and then sleeping.
+        Returns False on timeout.
+        """
+
+        spins = 0
+        deadline = None if timeout is None else _time.monotonic() + timeout
+
+        while not condition():
+            if spins < _SPIN_COUNT:
+                spins += 1
+                continue
+            if deadline is not None and _time.monotonic() >= deadline:
+                return False
+            _time.sleep(_SLEEP_TIME)
+
+        return True
+
+    def put(self, pulses_list, timeout:float=None):
+        """Writes a pulses list to the next slot, waiting for a free slot up to timeout seconds.
+        Must be called only from the producer process.
+        Returns True on success or False on timeout, when consumers are not keeping up.
+        """
+
+        length = len(pulses_list)
+
+        if (length > self.maxrawlen):
+            raise TypeError("in method 'put', argument 1 'pulses_list' must have at most %d pulses." % self.maxrawlen)
+
+        position = self._header[_WRITE]
+        index    = position % self.slots
+        sequence = self._sequences[index]
+
+        if not self._wait(lambda: sequence[0] == position, timeout):
+            return False
+
+        if not isinstance(pulses_list,memoryview):
+            pulses_list = _array('I', pulses_list)
+
+        self._pulses[index][:length] = pulses_list
+        self._lengths[index][0] = length
+
+        # Publish the slot, then the write cursor
+        sequence[0] = position + 1
+        self._header[_WRITE] = position + 1
+
+        return True
+
+    def get(self, timeout:float=None):
+        """Claims the next frame, waiting for it up to timeout seconds.
+        Returns a memoryview of its pulses, released on the next get() or release() call,
+        or None on timeout or when the ring is closed and drained.
+        """
+
+        self.release()
+
+        header = self._header
+        lock   = self._lock
+        claimed = list()
+
+        def claim():
+            # Read closed flag before cursors, so that no frame put before close() is missed
+            closed = header[_CLOSED]
+            if header[_READ] >= header[_WRITE]:
+                return bool(closed)
+            with lock:
+                position = header[_READ]
+                if position >= header[_WRITE]:
+                    return False
+                header[_READ] = position + 1
+            claimed.append(position)
+            return True
+
+        if not self._wait(claim, timeout) or not claimed:
+            return None
+
+        position = claimed[0]
+        index    = position % self.slots
+        sequence = self._sequences[index]
+
+        # Wait for the slot to be published by the producer, a claimed frame can not be given up
+        self._wait(lambda: sequence[0] == position + 1, None)
+
+        self._claimed = (position, index, self._pulses[index][:self._lengths[index][0]])
+
+        return self._claimed[2]
+
+    def release(self):
+        """Releases the last claimed frame, so that the producer can reuse its slot."""
+
+        if self._claimed is not None:
+            position, index, pulses = self._claimed
+            self._claimed = None
+            # Invalidate the memoryview given to the caller before the slot can be overwritten
+            pulses.release()
+            self._sequences[index][0] = position + self.slots
+
+    def __iter__(self):
+        """Yields memoryviews of frames until the ring is closed and drained."""
+
+        while True:
+            pulses = self.get()
+            if pulses is None:
+                return
+            yield pulses
+
+    def close(self):
+        """Marks the ring as closed, consumers stop when it is drained."""
+
+        self._header[_CLOSED] = 1
+
+    def unlink(self):
+        """Releases the shared memory block. Must be called by the creator process."""
+
+        self.release()
+        self._release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def _release(self):
+        """Releases all memoryviews, required before closing the shared memory block."""
+
+        for views in (self._sequences, self._lengths, self._pulses):
+            for view in views:
+                view.release()
+            views.clear()
+        self._header.release()
+
+    def detach(self):
+        """Closes the shared memory block in a consumer process."""
+
+        self.release()
+        self._release()
+        self._shm.close()
+
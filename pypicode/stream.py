@@ -0,0 +1,164 @@
+"""
+Bytes-level parser of pilight string streams for pyPiCode.
+
+Scans 'bytes', 'bytearray' or 'mmap' chunks holding many newline-delimited
+'c:...;p:...[;r:N]@' records, like a log of received signals, without decoding
+them to one Python string per record. Records split across chunk boundaries
+are kept as carry-over state until the next chunk.
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+from array import array as _array
+import mmap as _mmap
+import re as _re
+
+import pypicode as _picode
+from pypicode import _picode_wraper
+
+# Pilight string record: pulse indexes, pulse lengths table and optional repeats
+_RECORD = _re.compile(rb'c:([0-9]+);p:([0-9]+(?:,[0-9]+)*)(?:;r:[0-9]+)?@')
+
+# Translation table of pulse index digits '0' to '9' to byte values 0 to 9
+_DIGITS = bytes( i - 48 if 48 <= i <= 57 else i for i in range(256) )
+
+# Max length of an unterminated record kept as carry-over state
+_MAX_CARRY = 64 * 1024
+
+
+class PilightStreamParser:
+    """Parses chunks of pilight string records to pulse buffers or decoded results dicts.
+
+    decode:       if True, records are decoded by decodePulseTrain(), else pulse buffers are returned,
+                  as 'array' of unsigned 32 bits integers, which decodePulseTrain() accepts as memoryview.
+
+    Records are scanned by a compiled bytes regular expression and pulses are rebuilt from the
+    pulse lengths table by byte translation, so no Python string is created per record.
+    Malformed records, and any other text than whitespace between records, are skipped
+    and counted in 'errors'.
+    """
+
+    def __init__(self, decode:bool=False):
+
+        if (not isinstance(decode,bool)):
+            raise TypeError("in method 'PilightStreamParser', argument 1 'decode' must be a boolean.")
+
+        self.decode    = decode
+        self.maxrawlen = _picode_wraper.protocol_maxrawlen()
+        self.records   = 0
+        self.errors    = 0
+        self._carry    = b''
+
+    def _pulses(self, match):
+        """Builds a pulse buffer from a record match. Returns None on failure."""
+
+        code = match.group(1)
+
+        if len(code) > self.maxrawlen:
+            return None
+
+        table = [ int(pulse) for pulse in match.group(2).split(b',') ]
+
+        try:
+            return _array('I', map(table.__getitem__, code.translate(_DIGITS)))
+        except IndexError:
+            return None
+
+    def _parse(self, data, pos:int=0, endpos:int=None):
+        """Parses all complete records of a buffer between two positions."""
+
+        results = list()
+
+        if endpos is None:
+            endpos = len(data)
+
+        for match in _RECORD.finditer(data, pos, endpos):
+
+            self._skipped(data, pos, match.start())
+            pos = match.end()
+
+            pulses = self._pulses(match)
+
+            if pulses is None:
+                self.errors += 1
+                continue
+
+            self.records += 1
+
+            if self.decode:
+                results.append(_picode.decodePulseTrain(memoryview(pulses)))
+            else:
+                results.append(pulses)
+
+        self._skipped(data, pos, endpos)
+
+        return results
+
+    def _skipped(self, data, start:int, end:int):
+        """Counts as error any other text than whitespace between two positions."""
+
+        # Fast path for the usual single newline between records
+        if end - start == 0 or (end - start == 1 and data[start] == 10):
+            return
+
+        if data[start:end].strip():
+            self.errors += 1
+
+    def feed(self, chunk):
+        """Parses a chunk of records, keeping an unterminated last record for the next chunk.
+        Returns a list of pulse buffers, or of results dicts if 'decode' is True.
+        """
+
+        if (not isinstance(chunk,(bytes,bytearray,_mmap.mmap))):
+            raise TypeError("in method 'feed', argument 1 'chunk' must be a bytes, bytearray or mmap.")
+
+        first = chunk.find(b'@')
+
+        # No record end in chunk, all of it is carry-over
+        if first < 0:
+            self._keep(self._carry + chunk[:])
+            return list()
+
+        last = chunk.rfind(b'@')
+
+        # Complete the record split across the previous chunk boundary
+        results = self._parse(self._carry + chunk[:first+1])
+
+        results.extend(self._parse(chunk, first + 1, last + 1))
+
+        self._keep(chunk[last+1:])
+
+        return results
+
+    def _keep(self, carry:bytes):
+        """Keeps carry-over state, dropping it if too long to be a record."""
+
+        if len(carry) > _MAX_CARRY:
+            self.errors += 1
+            carry = b''
+
+        self._carry = bytes(carry)
+
+    def flush(self):
+        """Parses the carry-over state as the end of stream.
+        Returns a list of pulse buffers, or of results dicts if 'decode' is True.
+        """
+
+        carry, self._carry = self._carry, b''
+
+        return self._parse(carry)
+
+    def parseFile(self, path:str, chunk_size:int=1024*1024):
+        """Yields pulse buffers, or results dicts if 'decode' is True, of all records of a file."""
+
+        with open(path, 'rb') as file:
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                yield from self.feed(chunk)
+
+        yield from self.flush()
@@ -0,0 +1,82 @@
+"""
+Unit tests for pyPiCode fingerprint index of undecoded signals
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+import pickle
+import unittest
+from pypicode.fingerprint import FingerprintIndex
+
+class test_fingerprint(unittest.TestCase):
+
+    # Unknown signal with two pulse lengths tables within tolerance
+    pulses_list     = [300,900,900,300,300,900,300,900,900,300,300,900,9000]
+    pulses_list_jit = [302,905,905,302,302,905,302,905,905,302,302,905,9020]
+    pilight_string  = 'c:011001011001012;p:300,900,9000@'
+    pilight_other   = 'c:010101010101012;p:300,900,9000@'
+
+    def test_add(self):
+        index = FingerprintIndex()
+        first  = index.add(self.pulses_list, 1)
+        second = index.add(self.pulses_list_jit, 2)
+        self.assertIs(first, second)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(first.count, 2)
+        self.assertEqual(first.first_seen, 1)
+        self.assertEqual(first.last_seen, 2)
+        self.assertEqual(first.pulses(), self.pulses_list)
+
+    def test_addString(self):
+        index = FingerprintIndex()
+        index.addString(self.pilight_string, 1)
+        index.addString(self.pilight_other, 2)
+        index.addString(self.pilight_other, 3)
+        self.assertEqual([ cluster.count for cluster in index.clusters() ], [2, 1])
+        self.assertEqual(index.clusters(min_count=2)[0].representative, self.pilight_other)
+
+    def test_clusterPickle(self):
+        cluster = FingerprintIndex().addString(self.pilight_string, 1)
+        result = pickle.loads(pickle.dumps(cluster))
+        self.assertEqual(repr(result), repr(cluster))
+        self.assertEqual(result.fingerprint, cluster.fingerprint)
+
+    def test_addStringNoCode(self):
+        index = FingerprintIndex(code=False)
+        index.addString(self.pilight_string)
+        index.addString(self.pilight_other)
+        self.assertEqual(len(index), 1)
+
+    def test_addStringBucketEdge(self):
+        index = FingerprintIndex(tolerance=0.1)
+        # Pulse lengths 1100 and 1106 are on both sides of a bucket edge
+        self.assertNotEqual(index.fingerprint('c:01;p:1100,500@'), index.fingerprint('c:01;p:1106,500@'))
+        first  = index.addString('c:01;p:1100,500@')
+        second = index.addString('c:01;p:1106,500@')
+        self.assertIs(first, second)
+        self.assertEqual(len(index), 1)
+
+    def test_addStringFail(self):
+        self.assertIsNone(FingerprintIndex().addString("fail"))
+
+    def test_maxClusters(self):
+        index = FingerprintIndex(max_clusters=1)
+        index.addString(self.pilight_string)
+        index.addString(self.pilight_other)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.evicted, 1)
+        self.assertEqual(next(iter(index)).representative, self.pilight_other)
+
+    def test_addUnknown(self):
+        index = FingerprintIndex()
+        conrad_rsl_switch = [1400,600,600,1400,600,1400,600,1400,1400,600,1400,600,1400,600,600,1400,600,1400,600,1400,1400,600,600,1400,600,1400,600,1400,1400,600,600,1400,1400,600,600,1400,1400,600,1400,600,1400,600,600,1400,1400,600,600,1400,600,1400,600,1400,600,1400,600,1400,600,1400,600,1400,600,1400,600,1400,600,6800]
+        index.addUnknown(conrad_rsl_switch)
+        self.assertEqual(len(index), 0)
+        index.addUnknown(self.pulses_list)
+        self.assertEqual(len(index), 1)
+
+if __name__ == '__main__':
+    unittest.main()
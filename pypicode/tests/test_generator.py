@@ -0,0 +1,79 @@
+"""
+Unit tests for pyPiCode synthetic RF traffic generator
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+import io
+import unittest
+import pypicode as picode
+from pypicode.generator import PROTOCOL_NAMES, TrafficGenerator
+
+class test_generator(unittest.TestCase):
+
+    protocol_name = 'conrad_rsl_switch'
+    mix = {'conrad_rsl_switch': 1, 'arctech_switch': 1}
+
+    def test_frames(self):
+        generator = TrafficGenerator(self.mix, seed=1)
+        frames = list(generator.frames(20))
+        self.assertEqual(len(frames), 20)
+        for protocol_name, json_data, pulses_list in frames:
+            result = picode.decodePulseTrain(pulses_list)
+            self.assertIn(protocol_name, [ list(protocol)[0] for protocol in result['protocols'] ])
+
+    def test_framesSeeded(self):
+        first  = list(TrafficGenerator(self.mix, jitter=0.05, noise=0.2, truncate=0.1, repeats=(1,3), seed=7).frames(50))
+        second = list(TrafficGenerator(self.mix, jitter=0.05, noise=0.2, truncate=0.1, repeats=(1,3), seed=7).frames(50))
+        self.assertEqual(first, second)
+
+    def test_framesNoise(self):
+        generator = TrafficGenerator(self.mix, noise=1, seed=1)
+        for protocol_name, json_data, pulses_list in generator.frames(10):
+            self.assertIsNone(protocol_name)
+            self.assertIsNone(json_data)
+
+    def test_framesRepeats(self):
+        generator = TrafficGenerator(self.mix, repeats=3, seed=1)
+        frames = list(generator.frames(9))
+        for i in range(0, 9, 3):
+            self.assertEqual(frames[i], frames[i+1])
+            self.assertEqual(frames[i], frames[i+2])
+
+    def test_streamString(self):
+        sink = io.BytesIO()
+        written = TrafficGenerator(self.mix, seed=1).stream(sink, 10)
+        lines = sink.getvalue().decode('ascii').splitlines()
+        self.assertEqual(written, 10)
+        self.assertEqual(len(lines), 10)
+        for line in lines:
+            self.assertNotEqual(picode.decodeString(line)['protocols'], [])
+
+    def test_streamPulses(self):
+        sink = io.BytesIO()
+        TrafficGenerator(self.mix, seed=1).stream(sink, 5, format='pulses')
+        for line in sink.getvalue().decode('ascii').splitlines():
+            pulses_list = [ int(pulse) for pulse in line.split(",") ]
+            self.assertNotEqual(picode.decodePulseTrain(pulses_list)['protocols'], [])
+
+    def test_protocolNames(self):
+        generator = TrafficGenerator(seed=1)
+        self.assertIn('arctech_switch', generator.protocols)
+        self.assertIn(self.protocol_name, generator.protocols)
+        self.assertEqual(set(generator.protocols) | set(generator.dropped), set(PROTOCOL_NAMES))
+
+    def test_streamCount(self):
+        sink = io.BytesIO()
+        written = TrafficGenerator(self.mix, noise=0.5, truncate=0.5, seed=1).stream(sink, 50)
+        self.assertEqual(written, 50)
+        self.assertEqual(len(sink.getvalue().splitlines()), 50)
+
+    def test_mixFail(self):
+        with self.assertRaises(TypeError):
+            TrafficGenerator({'fail': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Unit tests for pyPiCode cross-receiver frame merger
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+import pickle
+import unittest
+from pypicode.merger import FrameMerger
+
+class test_merger(unittest.TestCase):
+
+    # Conrad RSL Switches Protocol
+    json_dict_out   = {'protocols': [{'conrad_rsl_switch': {'id': 1, 'unit': 2, 'state': 'on'}}]}
+    json_dict_order = {'protocols': [{'conrad_rsl_switch': {'state': 'on', 'unit': 2, 'id': 1}}]}
+    json_dict_off   = {'protocols': [{'conrad_rsl_switch': {'id': 1, 'unit': 2, 'state': 'off'}}]}
+    picode_string   = 'c:011010100101011010100110101001100110010101100110101010101010101012;p:1400,600,6800@'
+    picode_string_j = 'c:011010100101011010100110101001100110010101100110101010101010101012;p:1410,597,6820;r:5@'
+
+    def test_merge(self):
+        merger = FrameMerger(window=0.5)
+        self.assertEqual(merger.add(self.json_dict_out, 'rx1', 10.0), [])
+        self.assertEqual(merger.add(self.json_dict_order, 'rx2', 10.1), [])
+        self.assertEqual(merger.add(self.json_dict_out, 'rx3', 10.2), [])
+        self.assertEqual(len(merger), 1)
+        emitted = merger.add(self.json_dict_off, 'rx1', 11.0)
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0].sources, {'rx1', 'rx2', 'rx3'})
+        self.assertEqual(emitted[0].count, 3)
+        self.assertEqual(emitted[0].frame, self.json_dict_out)
+        self.assertEqual(emitted[0].first_seen, 10.0)
+        self.assertEqual(emitted[0].last_seen, 10.2)
+        self.assertEqual(len(merger.flush()), 1)
+        self.assertEqual(len(merger), 0)
+
+    def test_mergeString(self):
+        merger = FrameMerger()
+        merger.add(self.picode_string, 'rx1', 10.0)
+        merger.add(self.picode_string_j, 'rx2', 10.0)
+        emitted = merger.expire(20.0)
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0].sources, {'rx1', 'rx2'})
+
+    def test_mergeWindow(self):
+        merger = FrameMerger(window=0.5)
+        merger.add(self.json_dict_out, 'rx1', 10.0)
+        emitted = merger.add(self.json_dict_out, 'rx2', 10.6)
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0].sources, {'rx1'})
+        self.assertEqual(merger.flush()[0].sources, {'rx2'})
+
+    def test_mergeProtocolsOrder(self):
+        merger = FrameMerger()
+        merger.add({'protocols': [{'x': {'id': 1}}, {'y': {'id': 2}}]}, 'rx1', 10.0)
+        merger.add({'protocols': [{'y': {'id': 2}}, {'x': {'id': 1}}]}, 'rx2', 10.1)
+        self.assertEqual(len(merger), 1)
+        self.assertEqual(merger.flush()[0].sources, {'rx1', 'rx2'})
+
+    def test_mergeStringBucketEdge(self):
+        merger = FrameMerger(tolerance=0.1)
+        merger.add('c:01;p:1100,500@', 'rx1', 10.0)
+        merger.add('c:01;p:1106,500@', 'rx2', 10.0)
+        self.assertEqual(len(merger), 1)
+        self.assertEqual(merger.flush()[0].sources, {'rx1', 'rx2'})
+
+    def test_mergeLate(self):
+        merger = FrameMerger(window=0.5)
+        merger.add(self.json_dict_out, 'rx1', 10.0)
+        emitted = merger.add(self.json_dict_off, 'rx1', 10.6)
+        self.assertEqual(len(emitted), 1)
+        # Copy of the emitted transmission delayed past its window
+        self.assertEqual(merger.add(self.json_dict_out, 'rx2', 10.05), [])
+        self.assertEqual(merger.late, 1)
+        emitted = merger.flush()
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0].frame, self.json_dict_off)
+
+    def test_mergeOutOfOrder(self):
+        merger = FrameMerger(window=0.5)
+        self.assertEqual(merger.add(self.json_dict_out, 'rx1', 10.0), [])
+        # Copies older than the window are separate transmissions, emitted at once
+        emitted = merger.add(self.json_dict_out, 'rx2', 9.0)
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0].sources, {'rx2'})
+        emitted = merger.add(self.json_dict_out, 'rx3', 8.2)
+        self.assertEqual(len(emitted), 1)
+        self.assertEqual(emitted[0].sources, {'rx3'})
+        # Copies out of order within the window are merged, without moving the window
+        self.assertEqual(merger.add(self.json_dict_out, 'rx4', 9.6), [])
+        self.assertEqual(merger.add(self.json_dict_off, 'rx1', 9.9), [])
+        self.assertEqual(merger.expire(10.35), [])
+        emitted = merger.expire(10.6)
+        self.assertEqual([ merged.frame for merged in emitted ], [self.json_dict_off, self.json_dict_out])
+        self.assertEqual(emitted[1].sources, {'rx1', 'rx4'})
+        self.assertEqual(emitted[1].first_seen, 10.0)
+        self.assertEqual(len(merger), 0)
+
+    def test_mergeSkipped(self):
+        merger = FrameMerger()
+        merger.add({'protocols': []}, 'rx1', 10.0)
+        merger.add("fail", 'rx1', 10.0)
+        self.assertEqual(merger.skipped, 2)
+        self.assertEqual(len(merger), 0)
+
+    def test_mergedFramePickle(self):
+        merger = FrameMerger()
+        merger.add(self.json_dict_out, 'rx1', 10.0)
+        merged = merger.flush()[0]
+        result = pickle.loads(pickle.dumps(merged))
+        self.assertEqual(repr(result), repr(merged))
+
+if __name__ == '__main__':
+    unittest.main()
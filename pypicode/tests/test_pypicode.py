@@ -8,6 +8,7 @@ Copyright (c) 2022 Jorge Rivera. All right reserved.
 License GNU Lesser General Public License v3.0.
 """
 
+import pickle
 import unittest
 import pypicode as picode 
 
@@ -37,6 +38,12 @@ class test_pypicode(unittest.TestCase):
         result = picode.findProtocol("fail")
         self.assertIsNone(result)
 
+    def test_findProtocolPickle(self):
+        protocol = picode.findProtocol(self.protocol_name)
+        result = pickle.loads(pickle.dumps(protocol))
+        self.assertIs(result, protocol)
+        self.assertEqual(picode.encodeToPulseTrain(result,self.json_data_in), self.pulses_list)
+
     def test_pulseTrainToString(self):
         result = picode.pulseTrainToString(self.pulses_list)
         self.assertEqual(result, self.picode_string)
@@ -113,6 +120,24 @@ class test_pypicode(unittest.TestCase):
         result = picode.decodeString("fail")
         self.assertIsNone(result)
 
+    def test_protocolRankingUpdate(self):
+        ranking = picode.ProtocolRanking(0.5)
+        ranking.hit('arctech_switch')
+        ranking.update(picode.decodeString(self.picode_string))
+        ranking.update({'protocols': [{'arctech_switch': {}}, {self.protocol_name: {}}]})
+        self.assertDictEqual(ranking.scores(), {self.protocol_name: 1.5, 'arctech_switch': 1.25})
+        self.assertEqual(ranking.order(['arctech_switch',self.protocol_name]), [self.protocol_name,'arctech_switch'])
+
+    def test_protocolRankingFail(self):
+        with self.assertRaises(TypeError):
+            picode.ProtocolRanking(True)
+
+    def test_protocolRankingDecay(self):
+        ranking = picode.ProtocolRanking(0.5)
+        for protocol_name in ['a','a','b']:
+            ranking.hit(protocol_name)
+        self.assertDictEqual(ranking.scores(), {'b': 1, 'a': 0.75})
+
     def test_encodeToString(self):
         result = picode.encodeToString(self.protocol_name,self.json_data_in)
         self.assertEqual(result, self.picode_string)
@@ -0,0 +1,82 @@
+"""
+Unit tests for pyPiCode shared memory ring buffer
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+import multiprocessing
+import unittest
+import pypicode as picode
+from pypicode.ring import PulseRing
+
+def decode_worker(ring, results):
+    for pulses in ring:
+        results.put(picode.decodePulseTrain(pulses))
+    ring.detach()
+
+class test_ring(unittest.TestCase):
+
+    # Conrad RSL Switches Protocol
+    json_dict_out = {'protocols': [{'conrad_rsl_switch': {'id': 1, 'unit': 2, 'state': 'on'}}]}
+    pulses_list   = [1400,600,600,1400,600,1400,600,1400,1400,600,1400,600,1400,600,600,1400,600,1400,600,1400,1400,600,600,1400,600,1400,600,1400,1400,600,600,1400,1400,600,600,1400,1400,600,1400,600,1400,600,600,1400,1400,600,600,1400,600,1400,600,1400,600,1400,600,1400,600,1400,600,1400,600,1400,600,1400,600,6800]
+
+    def setUp(self):
+        self.ring = PulseRing(4)
+
+    def tearDown(self):
+        self.ring.unlink()
+
+    def test_putGet(self):
+        self.assertTrue(self.ring.put(self.pulses_list))
+        self.assertEqual(self.ring.get().tolist(), self.pulses_list)
+
+    def test_getTimeout(self):
+        self.assertIsNone(self.ring.get(timeout=0.01))
+
+    def test_putFull(self):
+        for _ in range(4):
+            self.assertTrue(self.ring.put(self.pulses_list))
+        self.assertFalse(self.ring.put(self.pulses_list, timeout=0.01))
+        self.ring.get()
+        self.ring.release()
+        self.assertTrue(self.ring.put(self.pulses_list, timeout=0.01))
+
+    def test_putTooLong(self):
+        with self.assertRaises(TypeError):
+            self.ring.put([1] * (self.ring.maxrawlen + 1))
+
+    def test_getReleased(self):
+        self.ring.put(self.pulses_list)
+        pulses = self.ring.get()
+        self.ring.release()
+        with self.assertRaises(ValueError):
+            pulses[0]
+
+    def test_decodeSlot(self):
+        self.ring.put(self.pulses_list)
+        self.assertDictEqual(picode.decodePulseTrain(self.ring.get()), self.json_dict_out)
+
+    def test_iterClosed(self):
+        for _ in range(3):
+            self.ring.put(self.pulses_list)
+        self.ring.close()
+        self.assertEqual(len([ pulses.tolist() for pulses in self.ring ]), 3)
+
+    def test_workers(self):
+        results = multiprocessing.Queue()
+        workers = [ multiprocessing.Process(target=decode_worker, args=(self.ring, results)) for _ in range(2) ]
+        for worker in workers:
+            worker.start()
+        for _ in range(20):
+            self.ring.put(self.pulses_list)
+        self.ring.close()
+        for _ in range(20):
+            self.assertDictEqual(results.get(timeout=10), self.json_dict_out)
+        for worker in workers:
+            worker.join()
+
+if __name__ == '__main__':
+    unittest.main()
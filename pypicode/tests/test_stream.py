@@ -0,0 +1,73 @@
+"""
+Unit tests for pyPiCode bytes-level pilight string stream parser
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+import mmap
+import tempfile
+import unittest
+import pypicode as picode
+from pypicode.stream import PilightStreamParser
+
+class test_stream(unittest.TestCase):
+
+    # Conrad RSL Switches Protocol
+    json_dict_out   = {'protocols': [{'conrad_rsl_switch': {'id': 1, 'unit': 2, 'state': 'on'}}]}
+    picode_string   = 'c:011010100101011010100110101001100110010101100110101010101010101012;p:1400,600,6800@'
+    picode_string_r = 'c:011010100101011010100110101001100110010101100110101010101010101012;p:1400,600,6800;r:5@'
+    stream          = (picode_string + "\n" + picode_string_r + "\nc:0123;p:1,2,3@\n").encode('ascii') * 10
+
+    def test_feed(self):
+        parser = PilightStreamParser()
+        result = parser.feed(self.stream)
+        self.assertEqual(len(result), 20)
+        for pulses in result:
+            self.assertEqual(pulses.tolist(), picode.stringToPulseTrain(self.picode_string))
+        self.assertEqual(parser.errors, 10)
+
+    def test_feedGarbage(self):
+        parser = PilightStreamParser()
+        result = parser.feed(b'garbage@\n' + self.picode_string.encode('ascii') + b'\nfail\n')
+        self.assertEqual(len(result), 1)
+        self.assertEqual(parser.errors, 1)
+        parser.flush()
+        self.assertEqual(parser.errors, 2)
+
+    def test_feedDecode(self):
+        result = PilightStreamParser(decode=True).feed(bytearray(self.stream))
+        self.assertEqual(result, [self.json_dict_out] * 20)
+
+    def test_feedSplit(self):
+        expected = PilightStreamParser().feed(self.stream)
+        for chunk_size in (1, 7, 64, 100):
+            parser = PilightStreamParser()
+            result = list()
+            for i in range(0, len(self.stream), chunk_size):
+                result.extend(parser.feed(self.stream[i:i+chunk_size]))
+            result.extend(parser.flush())
+            self.assertEqual(result, expected)
+
+    def test_feedMmap(self):
+        with tempfile.TemporaryFile() as file:
+            file.write(self.stream)
+            file.flush()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as chunk:
+                self.assertEqual(len(PilightStreamParser().feed(chunk)), 20)
+
+    def test_parseFile(self):
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(self.stream + self.picode_string.encode('ascii'))
+            file.flush()
+            result = list(PilightStreamParser(decode=True).parseFile(file.name, 50))
+        self.assertEqual(result, [self.json_dict_out] * 21)
+
+    def test_feedFail(self):
+        with self.assertRaises(TypeError):
+            PilightStreamParser().feed(self.picode_string)
+
+if __name__ == '__main__':
+    unittest.main()
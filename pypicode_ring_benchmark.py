@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark of 'pypicode.ring.PulseRing' shared memory ring buffer
+against a 'multiprocessing.Queue' baseline, from a producer process to decoder workers.
+
+See: https://github.com/latchdevel/pyPiCode
+
+Copyright (c) 2022-2024 Jorge Rivera. All right reserved.
+License GNU Lesser General Public License v3.0.
+"""
+
+import argparse, multiprocessing, time
+import pypicode as picode
+from pypicode.generator import TrafficGenerator
+from pypicode.ring import PulseRing
+
+def ring_worker(ring, decode, results):
+    frames = 0
+    for pulses in ring:
+        if decode:
+            picode.decodePulseTrain(pulses)
+        frames += 1
+    ring.detach()
+    results.put(frames)
+
+def queue_worker(queue, decode, results):
+    frames = 0
+    while True:
+        pulses = queue.get()
+        if pulses is None:
+            break
+        if decode:
+            picode.decodePulseTrain(pulses)
+        frames += 1
+    results.put(frames)
+
+def run(transport, frames, workers, decode):
+
+    results = multiprocessing.Queue()
+
+    if transport == 'ring':
+        channel = PulseRing(256)
+        target, put = ring_worker, channel.put
+    else:
+        channel = multiprocessing.Queue(256)
+        target, put = queue_worker, channel.put
+
+    processes = [ multiprocessing.Process(target=target, args=(channel, decode, results)) for _ in range(workers) ]
+
+    for process in processes:
+        process.start()
+
+    start = time.perf_counter()
+
+    for pulses in frames:
+        put(pulses)
+
+    if transport == 'ring':
+        channel.close()
+    else:
+        for _ in processes:
+            channel.put(None)
+
+    received = sum( results.get() for _ in processes )
+    elapsed = time.perf_counter() - start
+
+    for process in processes:
+        process.join()
+
+    if transport == 'ring':
+        channel.unlink()
+
+    assert received == len(frames)
+
+    return len(frames) / elapsed
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="PulseRing vs multiprocessing.Queue throughput benchmark.")
+    parser.add_argument("-n", "--count",   type=int, default=20000, help="number of frames")
+    parser.add_argument("-w", "--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--no-decode",     action='store_true', help="measure transport only")
+    args = parser.parse_args()
+
+    frames = [ pulses for _, _, pulses in TrafficGenerator(jitter=0.05, seed=1).frames(args.count) ]
+
+    print("frames: %d workers: %d decode: %s" % (len(frames), args.workers, not args.no_decode))
+
+    for transport in ('queue', 'ring'):
+        rate = run(transport, frames, args.workers, not args.no_decode)
+        print("%-6s %10.0f frames/s" % (transport, rate))